@@ -2,13 +2,19 @@
 
 import json
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
 import azure.functions as func
 
-from asiakasrajapinnat_master import load_customers_from_config, process_customer
+from asiakasrajapinnat_master import (
+    MAX_WORKERS,
+    load_customers_from_config,
+    process_customer,
+)
+from asiakasrajapinnat_master.customer import Customer
 from asiakasrajapinnat_master.main_config import load_main_config
-from asiakasrajapinnat_master.storage_handler import StorageHandler
+from asiakasrajapinnat_master.storage_handler import get_storage
 from asiakasrajapinnat_master.database_handler import DatabaseHandler
 
 
@@ -23,10 +29,10 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
         logging.error("No customer names provided in the request.")
         return func.HttpResponse("invalid_name", status_code=400)
 
-    conf_stg = StorageHandler(
+    conf_stg = get_storage(
         container_name="asiakasrajapinnat", verify_existence=True
     )
-    src_stg = StorageHandler(
+    src_stg = get_storage(
         container_name="vitecpowerbi", verify_existence=True
     )
 
@@ -41,24 +47,27 @@ def main(req: func.HttpRequest) -> func.HttpResponse:
         logging.warning("No matching customers found: %s", names)
         return func.HttpResponse("invalid_name", status_code=400)
 
-    responses = []
-    i = 1
-    try:
-        for customer in filtered_customers:
-            resp = process_customer(customer, src_stg, db)
-            responses.append({
-                "run": i,
-                "customer": customer.config.name,
-                "response": resp
-            })
-            i += 1
-
-    except Exception as exc:
-        logging.exception("Error processing customers: %s", exc)
-        responses.append({
+    def run_customer(customer: Customer) -> str | None:
+        try:
+            return process_customer(customer, src_stg, db)
+        except Exception as exc:
+            logging.exception(
+                "Error processing customer %s: %s", customer.config.name, exc)
+            return "Ajo epäonnistui"
+
+    # Customers are independent, run them in parallel like the timer does
+    workers = min(MAX_WORKERS, len(filtered_customers))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(run_customer, filtered_customers))
+
+    responses = [
+        {
             "run": i,
             "customer": customer.config.name,
-            "response": "Ajo epäonnistui"
-        })
+            "response": resp
+        }
+        for i, (customer, resp) in enumerate(
+            zip(filtered_customers, results), start=1)
+    ]
 
     return func.HttpResponse(json.dumps(responses), status_code=200)
@@ -1,13 +1,13 @@
 """Timer triggered pipeline that processes and exports customer data."""
 
-import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, List
-import traceback
+from zoneinfo import ZoneInfo
 
-import pytz
+import orjson
 import azure.functions as func
 from azure.storage.blob import ContentSettings
 
@@ -15,7 +15,7 @@ from .customer import Customer, CustomerConfig
 from .data_builder import DataBuilder
 from .data_editor import DataEditor
 from .main_config import load_main_config
-from .storage_handler import StorageHandler
+from .storage_handler import StorageHandler, get_storage
 from .esrs_data_parser import EsrsDataParser
 from .database_handler import DatabaseHandler
 
@@ -25,25 +25,50 @@ logging.getLogger("azure.storage.blob").setLevel(logging.WARNING)
 logging.getLogger("azure.core.pipeline.policies.http_logging_policy").setLevel(
     logging.WARNING)
 
+# Upper bound for the number of parallel config downloads and customer runs
+MAX_WORKERS = 8
+
+# Uploads of every customer share one small pool, so the parallel block
+# transfers stay within the shared BlobServiceClient's connection pool
+UPLOAD_WORKERS = 2
+_upload_executor = ThreadPoolExecutor(
+    max_workers=UPLOAD_WORKERS, thread_name_prefix="upload")
+
+FINLAND_TZ = ZoneInfo("Europe/Helsinki")
+
 
 def get_timestamp(strftime: str = "%Y-%m-%d %H:%M:%S") -> str:
     """
-    Return the current timestamp in the format 'YYYY-MM-DD_HH%M'
-    in Finland timezone.
+    Return the current time in Finland formatted with ``strftime``,
+    'YYYY-MM-DD HH:MM:SS' by default.
     """
-    finland_tz = pytz.timezone('Europe/Helsinki')
-    finland_time = datetime.now(finland_tz)
-    return finland_time.strftime(strftime)
+    return datetime.now(FINLAND_TZ).strftime(strftime)
 
 
 def load_customers_from_config(
         base_columns: Dict[str, Dict[str, str]],
-        storage: StorageHandler) -> List[Customer]:
-    """Read all customer JSON configs and instantiate ``Customer`` objects."""
+        storage: StorageHandler,
+        enabled_only: bool = False) -> List[Customer]:
+    """
+    Read all customer JSON configs and instantiate ``Customer`` objects.
+
+    With ``enabled_only`` disabled customers are skipped before any
+    ``Customer`` is built for them.
+    """
+    cfg_files = storage.iter_blobs_by_ext(".json", prefix="customer_config/")
+
+    # Download the configs in parallel while the listing is still being
+    # paged through, ``map`` keeps the listing order
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        blobs = list(executor.map(storage.download_blob, cfg_files))
+
     customers: List[Customer] = []
-    for cfg_file in storage.list_json_blobs(prefix="customer_config/"):
-        json_data = storage.download_blob(cfg_file)
-        data = json.loads(json_data)
+    for json_data in blobs:
+        data = orjson.loads(json_data)
+        if enabled_only and not data.get("enabled"):
+            logging.info(
+                "Skipping customer %s as it is not enabled.", data.get("name"))
+            continue
         cfg = CustomerConfig(base_columns=base_columns, **data)
         customer = Customer(cfg)
         customers.append(customer)
@@ -114,20 +139,33 @@ def process_customer(
     else:
         raise ValueError(f"Invalid file format: {customer.config.file_format}")
 
-    dst_stg = StorageHandler(
+    dst_stg = get_storage(
         customer.config.destination_container, verify_existence=True)
-    dst_stg.upload_blob(blob_name, data, content_settings=content_settings)
-
-    esrs_blob = f"esrs_report.json"
-    esrs_bytes = json.dumps(esrs_json, ensure_ascii=False).encode("utf-8")
-    dst_stg.upload_blob(
-        esrs_blob,
-        esrs_bytes,
-        content_settings=ContentSettings(
-            content_type="application/json; charset=utf-8"
+
+    esrs_blob = "esrs_report.json"
+    # The report values are numpy scalars, orjson writes them natively
+    esrs_bytes = orjson.dumps(esrs_json, option=orjson.OPT_SERIALIZE_NUMPY)
+
+    # The export and the ESRS report are independent, upload them side by side
+    uploads = [
+        _upload_executor.submit(
+            dst_stg.upload_blob,
+            blob_name,
+            data,
+            content_settings=content_settings,
         ),
-    )
-    
+        _upload_executor.submit(
+            dst_stg.upload_blob,
+            esrs_blob,
+            esrs_bytes,
+            content_settings=ContentSettings(
+                content_type="application/json; charset=utf-8"
+            ),
+        ),
+    ]
+    for upload in uploads:
+        upload.result()
+
     # Finally if nothing went wrong, move the src file to history
     src_stg.move_file_to_dir(
         source_blob_name=customer.file_in_process,
@@ -138,20 +176,38 @@ def process_customer(
     logging.info("Processed customer %s successfully.", customer.config.name)
     return "success"
 
+def process_customers(
+    customers: List[Customer], src_stg: StorageHandler, db: DatabaseHandler
+) -> List[Customer]:
+    """Process ``customers`` concurrently and return the ones that failed."""
+    failed_customers: List[Customer] = []
+    if not customers:
+        return failed_customers
+
+    workers = min(MAX_WORKERS, len(customers))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(process_customer, customer, src_stg, db): customer
+            for customer in customers
+        }
+        for future, customer in futures.items():
+            try:
+                future.result()
+            except Exception as err:
+                logging.exception(
+                    "Error processing customer %s: %s",
+                    customer.config.name,
+                    err,
+                )
+                failed_customers.append(customer)
+
+    return failed_customers
+
 def reprocess_customers(
     customers: List[Customer], src_stg: StorageHandler, db: DatabaseHandler
 ) -> List[Customer] | None:
     """Reprocess failed customers."""
-    failed_customers = []
-    
-    for customer in customers:
-        try:
-            process_customer(customer, src_stg, db)
-        except Exception as e:
-            logging.exception("Error reprocessing customers: %s", e)
-            failed_customers.append(customer)
-
-    return failed_customers
+    return process_customers(customers, src_stg, db)
 
 def main(mytimer: func.TimerRequest) -> None:
     """Entry point for the timer triggered function."""
@@ -159,33 +215,23 @@ def main(mytimer: func.TimerRequest) -> None:
         logging.info("Process started at %s.", get_timestamp())
         start_time = time.perf_counter()
 
-        conf_stg = StorageHandler(
+        conf_stg = get_storage(
             container_name="asiakasrajapinnat", verify_existence=True
         )
-        src_stg = StorageHandler(
+        src_stg = get_storage(
             container_name="vitecpowerbi", verify_existence=True
         )
 
         maincfg = load_main_config(conf_stg)
 
-        customers = load_customers_from_config(maincfg.base_columns, conf_stg)
-        logging.info("Loaded %d customers from config.", len(customers))
+        customers = load_customers_from_config(
+            maincfg.base_columns, conf_stg, enabled_only=True)
+        logging.info("Loaded %d enabled customers from config.", len(customers))
 
         db = DatabaseHandler(base_columns=maincfg.base_columns)
 
-        failed_customers = []
-        for customer in customers:
-            try:
-                process_customer(customer, src_stg, db)
-            except Exception as err:
-                logging.exception(
-                    "Error processing customer %s: %s",
-                    customer.config.name,
-                    err,
-                )
-                failed_customers.append(customer)
-                continue
-        
+        failed_customers = process_customers(customers, src_stg, db)
+
         retry_count = 2
         if failed_customers:
             logging.info("Retrying failed customers...")
@@ -6,8 +6,10 @@ from dataclasses import dataclass
 from typing import Dict, Optional, Set
 
 import pandas as pd
+from azure.storage.blob import BlobPrefix
+
 from .storage_handler import StorageHandler
-from .data_mappings import DataMappings
+from .data_mappings import CONCERN_COLUMN, DataMappings, encode_json_key
 
 
 @dataclass
@@ -44,35 +46,36 @@ class Customer:
 
     def get_data(self, stg: StorageHandler, stg_prefix: Optional[str] = None) -> pd.DataFrame:
         """Load the newest CSV file from the customer's source container."""
-        # 0) normalize and build our two “directories”
+        # 0) normalize the “directory” prefix
         prefix = stg_prefix.rstrip('/') + '/'
-        history_dir = prefix + 'history/'
-
-        # 1) list just the CSVs directly under `prefix`
-        all_blobs = stg.container_client.list_blobs(name_starts_with=prefix)
-        csv_blobs = [
-            b for b in all_blobs
-            if b.name.lower().endswith('.csv')
-               and '/' not in b.name[len(prefix):]  # no extra “subfolder”
-        ]
 
-        if not csv_blobs:
+        # 1) list only the direct children of `prefix`, the service folds
+        #    "subfolders" such as history/ into BlobPrefix entries
+        # 2) keep the latest CSV while walking the listing
+        latest = None
+        for blob in stg.container_client.walk_blobs(
+                name_starts_with=prefix, delimiter='/'):
+            if isinstance(blob, BlobPrefix) or not blob.name.lower().endswith('.csv'):
+                continue
+            if latest is None or blob.last_modified > latest.last_modified:
+                latest = blob
+
+        if latest is None:
             return pd.DataFrame()   # empty df so df.empty == True
 
-        # 2) pick the latest
-        latest = max(csv_blobs, key=lambda b: b.last_modified)
-
         # 3) download it
         data = stg.download_blob(latest.name)
 
         # 4) Save the file name so it can be moved later to history
         self.file_in_process = latest.name
 
-        # 5) parse and return
+        # 5) parse and return, skipping columns the mappings would drop anyway
+        allowed = self.mappings.allowed_columns
         df = pd.read_csv(io.BytesIO(data),
                          encoding='ISO-8859-1',
                          delimiter=';',
                          decimal=',',
+                         usecols=lambda c: c in allowed or c == CONCERN_COLUMN,
                          low_memory=False)
         
         logging.info(
@@ -126,3 +129,8 @@ class Customer:
         }
 
         self.mappings.allowed_columns = self.mappings.rename_map.copy()
+
+        # 4) pre-escaped ``"name":`` JSON key prefixes for the output columns
+        self.mappings.json_keys = {
+            name: encode_json_key(name) for name in self.mappings.dtype_map
+        }
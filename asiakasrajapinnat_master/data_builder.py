@@ -1,54 +1,71 @@
 """Helpers for building output files for each customer."""
 
-import json
-from typing import Any, Hashable
+import io
+from typing import List
 import numpy as np
+import orjson
 import pandas as pd
 from .customer import Customer
+from .data_mappings import encode_json_key
 
 
 class DataBuilder:
     """
-    A class to build a JSON object from a DataFrame.
+    Build the JSON and CSV output files from a DataFrame.
     """
 
     def __init__(self, customer: Customer):
         self.decimals_map = customer.mappings.decimals_map
 
-    def _format_json_row(self, row: dict[Hashable, Any]) -> str:
-        """Convert a pandas row to compact JSON without extra spaces."""
-        parts = []
-        for col, val in row.items():
-            # key as JSON string
-            key = json.dumps(col, ensure_ascii=False)
-            if col in self.decimals_map and pd.notna(val):
-                # numeric with fixed decimals
-                fmt = f"{{:.{self.decimals_map[col]}f}}"
-                num = fmt.format(val)
-                parts.append(f"{key}:{num}")
-            else:
-                # dump everything else normally (strings, ints, None, etc.)
-                parts.append(f"{key}:{json.dumps(val, ensure_ascii=False)}")
-        return "{" + ",".join(parts) + "}"
-
-    def build_json(self, df_final: pd.DataFrame) -> str:
-        """Return the dataframe as a JSON string."""
-        json_data = "["
-        rows = df_final.to_dict(orient="records")
-        for i, row in enumerate(rows):
-            json_data += self._format_json_row(row) + "\n"
-            if i < len(rows) - 1:
-                json_data += ","
-        json_data += "]"
-
-        return json_data
-
-    def build_csv(self, df_final: pd.DataFrame, encoding: str) -> str:
-        """Return the dataframe in CSV format using the given encoding."""
-        return df_final.to_csv(
+        # Loop invariant helpers, computed once per customer
+        self._json_keys = customer.mappings.json_keys
+        self._num_fmts = {
+            col: f"%.{decimals}f" for col, decimals in self.decimals_map.items()
+        }
+
+    def _format_json_values(self, col: str, series: pd.Series) -> List[bytes]:
+        """Return ``"key":value`` JSON fragments for every value in a column."""
+        key = self._json_keys.get(col)
+        if key is None:
+            key = encode_json_key(col)
+        fmt = self._num_fmts.get(col)
+        if fmt is not None:
+            # numeric with fixed decimals, formatted for the whole column at once
+            numbers = series.to_numpy(dtype=np.float64, na_value=np.nan)
+            formatted = np.where(
+                np.isnan(numbers), "null", np.char.mod(fmt, numbers))
+            return [key + v for v in formatted.astype(np.bytes_).tolist()]
+        # dump everything else normally (strings, ints, None, etc.)
+        # ``tolist`` extracts the column as native Python values
+        dumps = orjson.dumps
+        return [key + dumps(v) for v in series.tolist()]
+
+    def build_json(self, df_final: pd.DataFrame) -> bytes:
+        """Return the dataframe as UTF-8 encoded JSON."""
+        columns = [
+            self._format_json_values(col, df_final[col])
+            for col in df_final.columns
+        ]
+        rows = [b",".join(parts) for parts in zip(*columns)]
+        if not rows:
+            return b"[]"
+        # Bracket the first and last row so a single ``join`` sizes and
+        # fills the whole document, no growing buffer is needed
+        rows[0] = b"[{" + rows[0]
+        rows[-1] += b"}\n]"
+        return b"}\n,{".join(rows)
+
+    def build_csv(self, df_final: pd.DataFrame, encoding: str) -> bytes:
+        """Return the dataframe in CSV format encoded with ``encoding``."""
+        # Writing into a binary buffer lets pandas encode while it writes
+        # instead of building the whole document as a str first.
+        buf = io.BytesIO()
+        df_final.to_csv(
+            buf,
             index=False,
             encoding=encoding,
             sep=";",
             decimal=".",
             lineterminator="\n",
         )
+        return buf.getvalue()
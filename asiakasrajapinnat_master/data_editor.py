@@ -5,13 +5,16 @@ import numpy as np
 import pandas as pd
 
 from .customer import Customer
+from .data_mappings import CONCERN_COLUMN
 
 
 class DataEditor:
     """Utility class for cleaning and validating exported data."""
 
     def __init__(self, df: pd.DataFrame, customer: Customer):
-        self.df = df.copy()
+        # Shallow copy: every step replaces whole columns or frames, so the
+        # caller's frame is left untouched without duplicating its data
+        self.df = df.copy(deep=False)
         self.customer = customer
 
         self.target_row_count = len(self.df) - 1
@@ -20,7 +23,9 @@ class DataEditor:
 
     def delete_row(self, idx: int) -> "DataEditor":
         """Remove a row by index from the working DataFrame."""
-        self.df = self.df.drop(idx).reset_index(drop=True)
+        self.df = self.df.drop(idx)
+        # ``drop`` already returned a new frame, renumber it without a copy
+        self.df.reset_index(drop=True, inplace=True)
         return self
 
     def validate_concern_number(self) -> "DataEditor":
@@ -29,15 +34,16 @@ class DataEditor:
         (internal column name) is in customer.konserni.
         If any value fails, abort with an error.
         """
-        col = "PARConcern"
+        col = CONCERN_COLUMN
         if col not in self.df.columns:
             raise KeyError(f"Expected konserni-column '{col}' not found")
 
         allowed = set(self.customer.config.konserni)
-        unique_vals = set(self.df[col].astype(int))
+        values = self.df[col].astype(int)
+        invalid = ~values.isin(allowed)
 
-        if not unique_vals.issubset(allowed):
-            extra = unique_vals - allowed
+        if invalid.any():
+            extra = set(values[invalid].unique().tolist())
             raise ValueError(
                 f"Invalid konserni values found: {extra}\nAllowed values: {allowed}")
 
@@ -45,29 +51,41 @@ class DataEditor:
         return self
 
     def drop_unmapped_columns(self) -> "DataEditor":
-        """Remove columns that are not defined in the mapping."""
-        to_drop = set(self.df.columns) - \
-            set(self.mappings.allowed_columns.keys())
+        """
+        Remove columns that are not defined in the mapping.
 
-        self.df = self.df.drop(columns=to_drop)
+        The kept columns are selected in mapping order, so this also does the
+        work of ``reorder_columns`` without building another DataFrame.
+        """
+        to_drop = self.df.columns.difference(
+            list(self.mappings.allowed_columns.keys()))
 
-        if to_drop:
-            logging.info("Dropping unmapped columns: %s", to_drop)
+        if len(to_drop):
+            logging.info("Dropping unmapped columns: %s", list(to_drop))
+            self.df = self.df[self._ordered_columns()]
 
         return self
 
     def reorder_columns(self) -> "DataEditor":
         """Order columns according to the allowed mapping."""
-        ordered = [c for c in self.mappings.allowed_columns.keys()
-                   if c in self.df.columns]
-        self.df = self.df[ordered]
+        ordered = self._ordered_columns()
+        if list(self.df.columns) != ordered:
+            self.df = self.df[ordered]
         return self
 
+    def _ordered_columns(self) -> list:
+        """Return the present mapped columns in mapping order."""
+        present = set(self.df.columns)
+        return [c for c in self.mappings.allowed_columns.keys()
+                if c in present]
+
     def rename_and_cast_datatypes(self) -> "DataEditor":
         """
         Cast the DataFrame columns to their specified types and round them if necessary.
         """
-        self.df = self.df.rename(columns=self.mappings.rename_map)
+        # Relabel in place, the column data is already in its final frame
+        rename_map = self.mappings.rename_map
+        self.df.columns = [rename_map.get(c, c) for c in self.df.columns]
 
         valid_dtypes = {
             col: dt
@@ -82,8 +100,11 @@ class DataEditor:
             series = self.df[col]
 
             if dt.startswith('float'):
-                # normalize decimal separator
-                series = series.astype(str).str.replace(',', '.', regex=False)
+                # normalize decimal separator, columns that were already
+                # parsed as numbers skip the round trip through strings
+                if not pd.api.types.is_numeric_dtype(series):
+                    series = series.astype(str).str.replace(
+                        ',', '.', regex=False)
                 self.df[col] = series.astype(float)
 
                 decimals = self.mappings.decimals_map.get(col)
@@ -96,25 +117,40 @@ class DataEditor:
 
     def format_date_and_time(self) -> "DataEditor":
         """Normalize ``Pvm`` and ``Kello`` columns to ISO formats."""
-        def fmt_time(t) -> (str | None):
-            """Format time values to HH:MM or return ``None`` if empty."""
-            if pd.isna(t) or str(t).lower() == "nan":
-                return None
-            s = str(t)
+        # Parse the usual ``dd.mm.yyyy`` dates with an explicit format and
+        # only fall back to the slower inference for anything else.
+        pvm = self.df["Pvm"]
+        parsed = pd.to_datetime(
+            pvm, format="%d.%m.%Y", errors="coerce", cache=True)
+        unparsed = parsed.isna() & pvm.notna()
+        if unparsed.any():
+            parsed[unparsed] = pd.to_datetime(pvm[unparsed], dayfirst=True)
+        self.df["Pvm"] = parsed.dt.strftime("%Y-%m-%d")
+
+        # Format time values to HH:MM, empty values become ``None``
+        kello = self.df["Kello"]
+        text = kello.astype(str)
+        present = ~(kello.isna() | text.str.lower().eq("nan"))
+        formatted = pd.Series([None] * len(kello), index=kello.index, dtype=object)
+        if present.any():
+            parts = text[present].str.split(":", n=2, expand=True)
             # ensure leading zero, e.g. “8:5” → “08:05”
-            parts = s.split(":")
-            return f"{int(parts[0]):02d}:{int(parts[1]):02d}"
-
-        self.df["Pvm"] = (
-            pd.to_datetime(self.df["Pvm"], dayfirst=True)
-            .dt.strftime("%Y-%m-%d")
-        )
-        self.df["Kello"] = self.df["Kello"].apply(fmt_time)
+            hours = parts[0].astype(int).astype(str).str.zfill(2)
+            minutes = parts[1].astype(int).astype(str).str.zfill(2)
+            formatted[present] = hours + ":" + minutes
+        self.df["Kello"] = formatted
         return self
 
     def normalize_null_values(self) -> "DataEditor":
-        """Normalize null values in the DataFrame."""
-        self.df = self.df.replace({np.nan: None})
+        """
+        Normalize null values in the DataFrame.
+
+        Only object columns are converted to ``None``; numeric columns keep
+        their dtype and ``NaN``, which the output builders write as null.
+        """
+        object_cols = self.df.select_dtypes(include="object").columns
+        if len(object_cols):
+            self.df[object_cols] = self.df[object_cols].replace({np.nan: None})
         return self
 
     def clean_tapahtuma_id(self) -> "DataEditor":
@@ -123,7 +159,7 @@ class DataEditor:
         n_empty = empty_mask.sum()
         if n_empty > 0:
             # Remove rows with empty TapahtumaId
-            logging.warning(f"Removing {n_empty} empty TapahtumaId rows.")
+            logging.warning("Removing %d empty TapahtumaId rows.", n_empty)
             self.df = self.df[~empty_mask]
             self.target_row_count -= n_empty
 
@@ -131,7 +167,8 @@ class DataEditor:
         if dup_mask.any():
             dup_rows = dup_mask.sum()
             dup_values = self.df.loc[dup_mask, 'TapahtumaId'].nunique()
-            logging.warning(f"Removing {dup_values} duplicate TapahtumaId values.")
+            logging.warning(
+                "Removing %d duplicate TapahtumaId values.", dup_values)
             self.df = self.df[~dup_mask].reset_index(drop=True)
             self.target_row_count -= dup_rows
 
@@ -144,9 +181,13 @@ class DataEditor:
         warning_logs = []
         error_logs = []
 
+        columns = self.df.columns
+        present = set(columns)
+        expected = set(self.mappings.allowed_columns.values())
+
         # Check for missing columns
         missing = [col for col in self.mappings.allowed_columns.values()
-                   if col not in self.df.columns]
+                   if col not in present]
         if missing:
             warning_logs.append(
                 f"These base columns were not found in the DataFrame: {missing}"
@@ -157,14 +198,13 @@ class DataEditor:
             error_logs.append("DataFrame is empty after processing")
 
         # Check for extra columns
-        extras = set(self.df.columns) - \
-            set(self.mappings.allowed_columns.values())
+        extras = present - expected
         if extras:
             error_logs.append(
                 f"Unexpected extra columns in final DataFrame: {sorted(extras)}")
 
         # Check for duplicate column names
-        if len(self.df.columns) != len(self.df.columns.unique()):
+        if columns.has_duplicates:
             error_logs.append(
                 "Duplicate column names detected in final DataFrame")
 
@@ -178,12 +218,12 @@ class DataEditor:
         # Check for index integrity
         if not self.df.index.is_unique:
             error_logs.append("DataFrame index contains duplicates")
-        if list(self.df.index) != list(range(len(self.df))):
+        if not self.df.index.equals(pd.RangeIndex(current_row_count)):
             error_logs.append(
                 "DataFrame index is not a simple RangeIndex 0…n-1")
-            
+
         # Check if column TapahtumaId is present and doesn't have any NaN values or duplicates
-        if "TapahtumaId" in self.df.columns:
+        if "TapahtumaId" in present:
             if self.df["TapahtumaId"].isnull().any():
                 error_logs.append("Column 'TapahtumaId' contains NaN values")
             if self.df["TapahtumaId"].duplicated().any():
@@ -1,10 +1,17 @@
 """DataEditor mapping configuration."""
 
+import json
 from dataclasses import dataclass, field
 from typing import Dict, Union
 
+# Source column holding the concern number, validated against the customer
+CONCERN_COLUMN = "PARConcern"
 
 
+def encode_json_key(name: str) -> bytes:
+    """Return the UTF-8 encoded ``"name":`` JSON key prefix for ``name``."""
+    return (json.dumps(name, ensure_ascii=False) + ":").encode("utf-8")
+
 
 @dataclass
 class DataMappings:
@@ -16,3 +23,4 @@ class DataMappings:
     combined_columns: Dict[str, Dict[str, Union[str, int]]] = field(
         default_factory=dict)
     allowed_columns: Dict[str, str] = field(default_factory=dict)
+    json_keys: Dict[str, bytes] = field(default_factory=dict)
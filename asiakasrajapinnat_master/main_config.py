@@ -1,9 +1,11 @@
 
 """Load the global configuration used by the timer function."""
 
-import json
+import threading
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Tuple
+
+import orjson
 
 from .storage_handler import StorageHandler
 
@@ -15,11 +17,33 @@ class MainConfig:
     base_columns: Dict[str, Dict[str, str]]
 
 
+# Last loaded config and its ETag per container, reused while unchanged
+_cache: Dict[str, Tuple[str, MainConfig]] = {}
+_cache_lock = threading.Lock()
+
+
 def load_main_config(conf_stg: StorageHandler) -> MainConfig:
-    """Load ``main_config.json`` from storage and return the configuration."""
-    json_data = conf_stg.download_blob("main_config.json")
+    """
+    Load ``main_config.json`` from storage and return the configuration.
+
+    A warm instance only sends a conditional request, the blob is downloaded
+    and parsed again only when its ETag has changed.
+    """
+    with _cache_lock:
+        cached = _cache.get(conf_stg.container_name)
+    etag = cached[0] if cached else None
+
+    json_data, etag = conf_stg.download_blob_if_modified(
+        "main_config.json", etag)
+    if json_data is None and cached:
+        return cached[1]
     if not json_data:
         raise ValueError(
             "main_config.json is empty or not found in the storage.")
-    raw = json.loads(json_data)
-    return MainConfig(base_columns=raw.get("base_columns", {}))
+    raw = orjson.loads(json_data)
+    config = MainConfig(base_columns=raw.get("base_columns", {}))
+
+    if etag:
+        with _cache_lock:
+            _cache[conf_stg.container_name] = (etag, config)
+    return config
@@ -1,18 +1,48 @@
 """Simple wrapper around Azure Blob Storage operations."""
 
+import io
 import logging
 import os
-from typing import List, Optional
+import threading
+import time
+from typing import IO, Dict, Iterator, List, Optional, Tuple, Union
+from azure.core import MatchConditions
+from azure.core.exceptions import HttpResponseError, ResourceExistsError
 from azure.storage.blob import (
     BlobServiceClient,
     ContainerClient,
     BlobClient,
+    BlobProperties,
     ContentSettings,
 )
 
 
+# Client shared by every handler so they reuse one HTTP connection pool
+_blob_service: Optional[BlobServiceClient] = None
+_blob_service_lock = threading.Lock()
+
+
+def _get_blob_service() -> BlobServiceClient:
+    """Return the shared ``BlobServiceClient``, creating it on first use."""
+    global _blob_service
+    if _blob_service is None:
+        with _blob_service_lock:
+            if _blob_service is None:
+                _blob_service = BlobServiceClient.from_connection_string(
+                    os.environ["AzureWebJobsStorage"])
+    return _blob_service
+
+
 class StorageHandler:
     """Utility wrapper for interacting with a single blob container."""
+
+    # Number of parallel connections used for block transfers
+    max_concurrency = 8
+    # Seconds to wait between status checks of a pending blob copy
+    copy_poll_interval = 0.5
+    # Seconds to wait for a pending blob copy before aborting it
+    copy_timeout = 60
+
     def __init__(self, container_name: str, verify_existence: bool = False) -> None:
         """Initialize the StorageHandler with the specified container name.
 
@@ -24,17 +54,14 @@ class StorageHandler:
         Raises:
             ValueError: If the container does not exist and verify_existence is True.
         """
-        connection_str = os.environ["AzureWebJobsStorage"]
         self.container_name = container_name
-        self.blob_service = BlobServiceClient.from_connection_string(
-            connection_str)
+        self.blob_service = _get_blob_service()
         self.container_client: ContainerClient = self.blob_service.get_container_client(
             container_name)
 
         # Check if the container exists; if not, raise an error
-        if verify_existence and not self.container_exists():
-            raise ValueError(
-                f"Container '{container_name}' does not exist in Azure Blob Storage.")
+        if verify_existence:
+            self.ensure_exists()
 
     def container_exists(self) -> bool:
         """
@@ -43,17 +70,26 @@ class StorageHandler:
         """
         return self.container_client.exists()
 
-    def create_container(self) -> None:
+    def ensure_exists(self) -> None:
+        """Raise ``ValueError`` if the container does not exist."""
+        if not self.container_exists():
+            raise ValueError(
+                f"Container '{self.container_name}' does not exist in Azure Blob Storage.")
+
+    def create_container(self) -> bool:
         """
         Create the container if it does not already exist.
+        :return: True if the container was created, False if it already existed.
         """
-        if not self.container_client.exists():
+        try:
             self.container_client.create_container()
-            logging.info("Container '%s' created.", self.container_name)
-        else:
+        except ResourceExistsError:
             logging.info(
                 "Container '%s' already exists.", self.container_name
             )
+            return False
+        logging.info("Container '%s' created.", self.container_name)
+        return True
 
     def list_blobs(self, prefix: Optional[str] = None) -> List[str]:
         """
@@ -64,15 +100,35 @@ class StorageHandler:
         blobs = self.container_client.list_blobs(name_starts_with=prefix)
         return [b.name for b in blobs]
 
+    def iter_blob_properties_by_ext(
+        self, ext: str, prefix: Optional[str] = None
+    ) -> Iterator[BlobProperties]:
+        """Lazily yield properties of blobs under ``prefix`` ending with ``ext``."""
+        ext = ext.lower()
+        for blob in self.container_client.list_blobs(name_starts_with=prefix):
+            if blob.name.lower().endswith(ext):
+                yield blob
+
+    def iter_blobs_by_ext(
+        self, ext: str, prefix: Optional[str] = None
+    ) -> Iterator[str]:
+        """Lazily yield names of blobs under ``prefix`` ending with ``ext``."""
+        for blob in self.iter_blob_properties_by_ext(ext, prefix):
+            yield blob.name
+
     def list_csv_blobs(self, prefix: Optional[str] = None) -> List[str]:
         """List CSV blobs under the optional prefix."""
-        blobs = self.container_client.list_blobs(name_starts_with=prefix)
-        return [b.name for b in blobs if b.name.lower().endswith(".csv")]
+        return list(self.iter_blobs_by_ext(".csv", prefix))
 
     def list_json_blobs(self, prefix: Optional[str] = None) -> List[str]:
         """List JSON blobs under the optional prefix."""
-        blobs = self.container_client.list_blobs(name_starts_with=prefix)
-        return [b.name for b in blobs if b.name.lower().endswith(".json")]
+        return list(self.iter_blobs_by_ext(".json", prefix))
+
+    def prefix_exists(self, prefix: str) -> bool:
+        """Return True if at least one blob name starts with ``prefix``."""
+        blobs = self.container_client.list_blobs(
+            name_starts_with=prefix, results_per_page=1)
+        return next(iter(blobs), None) is not None
 
     def blob_exists(self, blob_name: str) -> bool:
         """Check if ``blob_name`` exists in this container."""
@@ -84,24 +140,61 @@ class StorageHandler:
         blob_client: BlobClient = self.container_client.get_blob_client(
             blob_name
         )
-        return blob_client.download_blob().readall()
+        return blob_client.download_blob(
+            max_concurrency=self.max_concurrency).readall()
+
+    def download_blob_if_modified(
+        self, blob_name: str, etag: Optional[str] = None
+    ) -> Tuple[Optional[bytes], Optional[str]]:
+        """
+        Download ``blob_name`` unless its ETag still equals ``etag``.
+        :return: ``(data, etag)`` of the blob, ``data`` is ``None`` if unchanged.
+        """
+        blob_client: BlobClient = self.container_client.get_blob_client(
+            blob_name
+        )
+        conditions = {}
+        if etag:
+            conditions = {"etag": etag,
+                          "match_condition": MatchConditions.IfModified}
+        try:
+            downloader = blob_client.download_blob(
+                max_concurrency=self.max_concurrency, **conditions)
+        except HttpResponseError as err:
+            # The SDK surfaces a 304 as a generic (or ResourceModified) error
+            if err.status_code == 304:
+                return None, etag
+            raise
+        return downloader.readall(), downloader.properties.etag
 
     def upload_blob(
         self,
         blob_name: str,
-        data: bytes,
+        data: Union[bytes, str, IO[bytes]],
         overwrite: bool = True,
         content_settings: Optional[ContentSettings] = None,
     ) -> None:
-        """Upload data to ``blob_name`` within this container."""
+        """Upload data to ``blob_name`` within this container.
+
+        ``data`` may be bytes, a string or a readable binary stream. Bytes are
+        wrapped in a stream so large payloads are sent as parallel blocks.
+        """
         blob_client: BlobClient = self.container_client.get_blob_client(
             blob_name
         )
 
-        if content_settings is None:
-            blob_client.upload_blob(data, overwrite=overwrite)
-        else:
-            blob_client.upload_blob(data, overwrite=overwrite, content_settings=content_settings)
+        length = None
+        if isinstance(data, (bytes, bytearray)):
+            length = len(data)
+            data = io.BytesIO(data)
+
+        blob_client.upload_blob(
+            data,
+            length=length,
+            overwrite=overwrite,
+            content_settings=content_settings,
+            max_concurrency=self.max_concurrency,
+        )
 
     def move_file_to_dir(
         self,
@@ -126,11 +219,35 @@ class StorageHandler:
         # build the new blob name
         dest_blob_name = f"{dest_dir}{filename}"
 
-        # 1) download the original
-        data = self.download_blob(source_blob_name)
+        source_client: BlobClient = self.container_client.get_blob_client(
+            source_blob_name
+        )
+        dest_client: BlobClient = self.container_client.get_blob_client(
+            dest_blob_name
+        )
 
-        # 2) upload to the new location
-        self.upload_blob(dest_blob_name, data, overwrite=overwrite)
+        # 1) copy server side, the data never passes through this process
+        copy_kwargs = {}
+        if not overwrite:
+            copy_kwargs = {"etag": "*",
+                           "match_condition": MatchConditions.IfMissing}
+        copy = dest_client.start_copy_from_url(source_client.url, **copy_kwargs)
+
+        # 2) same-account copies usually finish immediately, wait if not
+        status = copy["copy_status"]
+        deadline = time.monotonic() + self.copy_timeout
+        while status == "pending":
+            if time.monotonic() >= deadline:
+                dest_client.abort_copy(copy["copy_id"])
+                raise RuntimeError(
+                    f"Copying blob '{source_blob_name}' to '{dest_blob_name}' "
+                    f"did not finish within {self.copy_timeout} seconds.")
+            time.sleep(self.copy_poll_interval)
+            status = dest_client.get_blob_properties().copy.status
+        if status != "success":
+            raise RuntimeError(
+                f"Copying blob '{source_blob_name}' to '{dest_blob_name}' "
+                f"failed with status '{status}'.")
 
         # 3) delete the original
         self.container_client.delete_blob(source_blob_name)
@@ -143,3 +260,24 @@ class StorageHandler:
         )
 
         return dest_blob_name
+
+
+# Handlers are cheap to share, one per container for the process lifetime
+_handlers: Dict[str, StorageHandler] = {}
+
+
+def get_storage(container_name: str, verify_existence: bool = False) -> StorageHandler:
+    """Return the cached ``StorageHandler`` for ``container_name``.
+
+    The handler is created on first use. ``verify_existence`` is checked on
+    every call that asks for it, also for an already cached handler, and a
+    failed check raises ``ValueError``.
+    """
+    handler = _handlers.get(container_name)
+    if handler is None:
+        # Built outside any lock; if two callers race, the first one stored wins
+        handler = _handlers.setdefault(
+            container_name, StorageHandler(container_name))
+    if verify_existence:
+        handler.ensure_exists()
+    return handler
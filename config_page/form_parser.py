@@ -4,13 +4,40 @@ import json
 import logging
 import re
 from typing import Any, Dict, List, Tuple
-from urllib.parse import parse_qs
+from urllib.parse import parse_qsl
 
+import orjson
 
 from .storage_utils import create_containers
 from .utils import flash
 from .exceptions import InvalidInputError
 
+# A single, optionally signed, integer konserni id
+_KONSERNI_RE = re.compile(r"[+-]?\d+")
+
+# Fields repeated once per column row, every other field is single valued
+MULTI_VALUE_FIELDS = frozenset({
+    "key", "name", "dtype", "decimals", "length",
+    "extra_key", "extra_name", "extra_dtype", "exclude_columns",
+})
+
+
+def split_form_fields(body: str) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """
+    Parse a urlencoded ``body`` in one pass into single and repeated values.
+
+    Single values keep the first occurrence of a field, repeated values are
+    only collected for ``MULTI_VALUE_FIELDS``.
+    """
+    scalars: Dict[str, str] = {}
+    multis: Dict[str, List[str]] = {}
+    for key, value in parse_qsl(body, keep_blank_values=True):
+        if key not in scalars:
+            scalars[key] = value
+        if key in MULTI_VALUE_FIELDS:
+            multis.setdefault(key, []).append(value)
+    return scalars, multis
+
 
 def is_valid_container_name(name: str) -> bool:
     """Return True if ``name`` is a valid Azure container name."""
@@ -20,33 +47,36 @@ def is_valid_container_name(name: str) -> bool:
 
 
 def _parse_base_columns(
-    parsed: Dict[str, List[str]], messages: List[Dict[str, str]]
+    multis: Dict[str, List[str]], messages: List[Dict[str, str]]
 ) -> Dict[str, Dict[str, Any]]:
     """Extract base column configuration from parsed form data."""
-    keys = parsed.get("key", [])
-    names = parsed.get("name", [])
-    dtypes = parsed.get("dtype", [])
-    decimals = parsed.get("decimals", [])
-    lengths = parsed.get("length", [])
+    keys = multis.get("key", [])
+    names = multis.get("name", [])
+    dtypes = multis.get("dtype", [])
+    decimals = multis.get("decimals", [])
+    lengths = multis.get("length", [])
 
     basecols: Dict[str, Dict[str, Any]] = {}
     for k, n, dt, dec, length in zip(keys, names, dtypes, decimals, lengths):
         k = k.strip()
         if not k:
             continue
-        col = {"name": n.strip(), "dtype": dt.strip()}
-        if dt.strip() == "float" and dec.strip():
+        dt = dt.strip()
+        dec = dec.strip()
+        length = length.strip()
+        col = {"name": n.strip(), "dtype": dt}
+        if dt == "float" and dec:
             try:
                 col["decimals"] = int(dec)
             except ValueError:
                 flash(messages, "error",
-                      f"Invalid decimal value for column '{k}': {dec.strip()}")
-        if dt.strip() == "string" and length.strip():
+                      f"Invalid decimal value for column '{k}': {dec}")
+        if dt == "string" and length:
             try:
                 col["length"] = int(length)
             except ValueError:
                 flash(messages, "error",
-                      f"Invalid length value for column '{k}': {length.strip()}")
+                      f"Invalid length value for column '{k}': {length}")
         basecols[k] = col
     return basecols
 
@@ -55,44 +85,43 @@ def _parse_konserni_list(raw_value: str, messages: List[Dict[str, str]]) -> List
     """Parse a comma separated list of konserni ids."""
     konserni_list: List[int] = []
     for part in filter(None, [p.strip() for p in raw_value.split(",")]):
-        try:
+        if _KONSERNI_RE.fullmatch(part):
             konserni_list.append(int(part))
-        except ValueError:
+        else:
             logging.warning("Ignoring non-numeric konserni token: '%s'", part)
             flash(messages, "error", f"Invalid konserni value: '{part}'. "
                   "Please enter numeric values only.")
     return konserni_list
 
 
-def _parse_extra_columns(parsed: Dict[str, List[str]]) -> Dict[str, Dict[str, str]]:
+def _parse_extra_columns(multis: Dict[str, List[str]]) -> Dict[str, Dict[str, str]]:
     """Extract extra column configuration from parsed form data."""
-    extra_keys = parsed.get("extra_key", [])
-    extra_names = parsed.get("extra_name", [])
-    extra_dtypes = parsed.get("extra_dtype", [])
+    extra_keys = multis.get("extra_key", [])
+    extra_names = multis.get("extra_name", [])
+    extra_dtypes = multis.get("extra_dtype", [])
 
-    extra_columns: Dict[str, Dict[str, str]] = {}
-    for key, disp, dt in zip(extra_keys, extra_names, extra_dtypes):
-        key = key.strip()
-        if key:
-            extra_columns[key] = {"name": disp.strip(), "dtype": dt.strip()}
-    return extra_columns
+    return {
+        key: {"name": disp.strip(), "dtype": dt.strip()}
+        for raw_key, disp, dt in zip(extra_keys, extra_names, extra_dtypes)
+        if (key := raw_key.strip())
+    }
 
 
-def _parse_enabled(method: str, parsed: Dict[str, List[str]]) -> bool:
+def _parse_enabled(method: str, scalars: Dict[str, str]) -> bool:
     """Determine the enabled state for the configuration."""
     if method == "create_customer":
         return True
-    return parsed.get("enabled", [""])[0].strip().lower() == "true"
+    return scalars.get("enabled", "").strip().lower() == "true"
 
 
 def _parse_containers(
-    parsed: Dict[str, List[str]], messages: List[Dict[str, str]]
+    scalars: Dict[str, str], messages: List[Dict[str, str]]
 ) -> Tuple[str, str, str, str]:
     """Extract and validate container related values from parsed form data."""
-    src_container = parsed.get("src_container", [""])[0].strip().lower()
-    dest_container = parsed.get("dest_container", [""])[0].strip().lower()
-    file_format = parsed.get("file_format", [""])[0].strip().lower()
-    file_encoding = parsed.get("file_encoding", [""])[0].strip().lower()
+    src_container = scalars.get("src_container", "").strip().lower()
+    dest_container = scalars.get("dest_container", "").strip().lower()
+    file_format = scalars.get("file_format", "").strip().lower()
+    file_encoding = scalars.get("file_encoding", "").strip().lower()
 
     # Source container validation is unnecessary since it's not a container, 
     # but a directory within the container.
@@ -142,22 +171,22 @@ def parse_form_data(
     messages: List[Dict[str, str]],
 ) -> Tuple[str, Any]:
     """Parse POSTed form data and return method and configuration."""
-    parsed = parse_qs(body, keep_blank_values=True)
+    scalars, multis = split_form_fields(body)
 
-    method = parsed.get("method", [""])[0].strip().lower()
+    method = scalars.get("method", "").strip().lower()
     logging.info("Form method received: %s", method)
     if method == "edit_base_columns":
-        basecols = _parse_base_columns(parsed, messages)
+        basecols = _parse_base_columns(multis, messages)
         return method, basecols
 
     if method == "delete_customer":
-        name = parsed.get("name", [""])[0].strip().lower()
+        name = scalars.get("name", "").strip().lower()
         return method, name
 
     if method == "update_enabled":
-        statuses_raw = parsed.get("statuses", ["{}"])[0]
+        statuses_raw = scalars.get("statuses", "{}")
         try:
-            statuses = json.loads(statuses_raw) if statuses_raw else {}
+            statuses = orjson.loads(statuses_raw) if statuses_raw else {}
         except json.JSONDecodeError as exc:
             raise InvalidInputError("Invalid statuses") from exc
         return method, statuses
@@ -165,19 +194,18 @@ def parse_form_data(
     if method not in ["create_customer", "edit_customer"]:
         raise InvalidInputError("Invalid method")
 
-    enabled = _parse_enabled(method, parsed)
-    name = parsed.get("name", [""])[0].strip().lower()
-    original_name = parsed.get("original_name", [""])[0].strip().lower()
-    konserni_raw = parsed.get("konserni", [""])[0].strip()
+    enabled = _parse_enabled(method, scalars)
+    name = scalars.get("name", "").strip().lower()
+    original_name = scalars.get("original_name", "").strip().lower()
+    konserni_raw = scalars.get("konserni", "").strip()
     konserni_list = _parse_konserni_list(konserni_raw, messages)
     src_container, dest_container, file_format, file_encoding = _parse_containers(
-        parsed, messages)
-    extra_columns = _parse_extra_columns(parsed)
-    exclude_list = parsed.get("exclude_columns", [])
+        scalars, messages)
+    extra_columns = _parse_extra_columns(multis)
+    exclude_list = multis.get("exclude_columns", [])
 
     if method == "create_customer":
-        check_str = parsed.get("create_containers_check", [""])[
-            0].strip().lower()
+        check_str = scalars.get("create_containers_check", "").strip().lower()
         if (
             check_str == "true"
             and is_valid_container_name(dest_container.strip("/"))
@@ -2,9 +2,10 @@
 
 import json
 import logging
-from typing import Any, Dict, List, Optional
-from urllib.parse import parse_qs
+from urllib.parse import urlencode
+from typing import Any, Dict, List, Optional, Tuple
 
+import orjson
 import azure.functions as func
 from azure.core.exceptions import AzureError
 from azure.storage.blob import ContentSettings
@@ -12,7 +13,7 @@ from jinja2 import TemplateError
 
 from asiakasrajapinnat_master.main_config import load_main_config
 
-from .form_parser import parse_form_data
+from .form_parser import parse_form_data, split_form_fields
 from .storage_utils import conf_stg, get_customers
 from .exceptions import ClientError, InvalidInputError
 from .utils import (
@@ -24,8 +25,55 @@ from .utils import (
     generate_csrf_token,
     validate_csrf_token,
     parse_cookie,
+    encode_flash,
+    decode_flash,
 )
 
+# Pages whose templates list the customers / render the base column table
+CUSTOMER_PAGES = frozenset({"edit_customer", "create_customer", "manual_run"})
+BASE_COLUMN_PAGES = frozenset(
+    {"edit_customer", "create_customer", "edit_base_columns"})
+
+
+def _bundle(blocks: List[str]) -> Tuple[str, ...]:
+    """Join static ``blocks`` so a template emits them as one piece."""
+    return ("\n".join(blocks),) if blocks else ()
+
+
+# Template and static blocks of every page, assembled once at import
+PAGE_LAYOUTS: Dict[str, Dict[str, Any]] = {
+    "edit_customer": {
+        "template_name": "customer_config_form.html",
+        "css_blocks": _bundle(get_css_blocks(["customer_config.css"])),
+        "js_blocks": _bundle(get_js_blocks(["customer_config.js"])),
+    },
+    "create_customer": {
+        "template_name": "customer_config_form.html",
+        "css_blocks": _bundle(get_css_blocks(["customer_config.css"])),
+        "js_blocks": _bundle(get_js_blocks(["customer_config.js"])),
+    },
+    "edit_base_columns": {
+        "template_name": "edit_base_columns_form.html",
+        "css_blocks": _bundle(get_css_blocks(["edit_base_columns.css"])),
+        "js_blocks": _bundle(get_js_blocks(["edit_base_columns.js"])),
+    },
+    "home": {
+        "template_name": "index.html",
+        "css_blocks": _bundle(get_css_blocks(["index.css"])),
+        "js_blocks": _bundle(get_js_blocks()),
+    },
+    "manual_run": {
+        "template_name": "manual_run.html",
+        "css_blocks": _bundle(get_css_blocks(
+            ["customer_config.css", "manual_run.css"])),
+        "js_blocks": _bundle(get_js_blocks(["manual_run.js"])),
+    },
+}
+HTML_BLOCKS = tuple(get_html_blocks())
+
+# Pages that render the same on every GET, no customers, data or form token
+STATIC_PAGES = frozenset({"home"})
+
 
 def prepare_template_context(
     method: str = "",
@@ -37,46 +85,25 @@ def prepare_template_context(
     if messages is None:
         messages = []
 
-    template_name = "customer_config_form.html"
-
-    if method == "edit_customer":
-        css_blocks = get_css_blocks(
-            file_specific_styles=["customer_config.css"])
-        js_blocks = get_js_blocks(file_specific_scripts=["customer_config.js"])
-    elif method == "create_customer":
-        css_blocks = get_css_blocks(
-            file_specific_styles=["customer_config.css"])
-        js_blocks = get_js_blocks(file_specific_scripts=["customer_config.js"])
-    elif method == "edit_base_columns":
-        template_name = "edit_base_columns_form.html"
-        css_blocks = get_css_blocks(file_specific_styles=["edit_base_columns.css"])
-        js_blocks = get_js_blocks(file_specific_scripts=["edit_base_columns.js"])
-    elif method == "home":
-        template_name = "index.html"
-        css_blocks = get_css_blocks(file_specific_styles=["index.css"])
-        js_blocks = get_js_blocks()
-    elif method == "manual_run":
-        template_name = "manual_run.html"
-        css_blocks = get_css_blocks(file_specific_styles=["customer_config.css", "manual_run.css"])
-        js_blocks = get_js_blocks(file_specific_scripts=["manual_run.js"])
-    else:
+    layout = PAGE_LAYOUTS.get(method)
+    if layout is None:
         logging.error("Unknown method '%s' in request", method)
         raise ClientError(f"Unknown method '{method}'")
 
-    html_blocks = get_html_blocks()
-
-    customers = get_customers()
-    main_config = load_main_config(conf_stg)
+    # Only hit storage for data the chosen page actually renders
+    customers = get_customers() if method in CUSTOMER_PAGES else []
+    base_columns = (
+        load_main_config(conf_stg).base_columns
+        if method in BASE_COLUMN_PAGES else {}
+    )
 
     return {
-        "template_name": template_name,
+        **layout,
         "method": method,
-        "css_blocks": css_blocks,
-        "js_blocks": js_blocks,
-        "html_blocks": html_blocks,
+        "html_blocks": HTML_BLOCKS,
         "customers": customers,
         "messages": messages,
-        "base_columns": main_config.base_columns,
+        "base_columns": base_columns,
         "csrf_token": csrf_token,
     }
 
@@ -96,7 +123,8 @@ def handle_get(req: func.HttpRequest) -> func.HttpResponse:
     try:
         logging.info("Processing GET request")
         method = req.params.get("method", "").strip()
-        messages: List[Dict[str, str]] = []
+        # Messages carried over from a POST that redirected here
+        messages = decode_flash(req.params.get("flash", ""))
         token, cookie_val = generate_csrf_token()
         context = prepare_template_context(
             method=method, messages=messages, csrf_token=token
@@ -105,6 +133,12 @@ def handle_get(req: func.HttpRequest) -> func.HttpResponse:
             "Set-Cookie": f"csrf_token={cookie_val}; HttpOnly; Path=/"
         }
         logging.info("Returning template %s", context["template_name"])
+        if method in STATIC_PAGES and not messages:
+            return render_template(
+                context,
+                cache_key=method,
+                if_none_match=req.headers.get("If-None-Match", ""),
+            )
         return render_template(context)
     except (TemplateError, AzureError) as err:
         return handle_error(err)
@@ -116,8 +150,7 @@ def handle_post(req: func.HttpRequest) -> func.HttpResponse:
         logging.info("Processing POST request")
         messages: List[Dict[str, str]] = []
         raw_body = req.get_body().decode("utf-8")
-        parsed = parse_qs(raw_body, keep_blank_values=True)
-        form_token = parsed.get("csrf_token", [""])[0]
+        form_token = split_form_fields(raw_body)[0].get("csrf_token", "")
         cookie_header = req.headers.get("Cookie", "")
         cookie_token = parse_cookie(cookie_header).get("csrf_token", "")
         if not validate_csrf_token(form_token, cookie_token):
@@ -147,7 +180,7 @@ def handle_post(req: func.HttpRequest) -> func.HttpResponse:
             new_cfg = {"base_columns": result}
             conf_stg.upload_blob(
                 "main_config.json",
-                json.dumps(new_cfg, ensure_ascii=False).encode("utf-8"),
+                orjson.dumps(new_cfg),
                 overwrite=True,
                 content_settings=ContentSettings(
                     content_type="application/json; charset=utf-8"
@@ -173,8 +206,7 @@ def handle_post(req: func.HttpRequest) -> func.HttpResponse:
                 logging.info("Uploading configuration for customer '%s'", name)
                 conf_stg.upload_blob(
                     blob_name=f"customer_config/{name}.json",
-                    data=json.dumps(
-                        result, ensure_ascii=False).encode("utf-8"),
+                    data=orjson.dumps(result),
                     overwrite=True,
                     content_settings=ContentSettings(
                         content_type="application/json; charset=utf-8"
@@ -211,12 +243,11 @@ def handle_post(req: func.HttpRequest) -> func.HttpResponse:
                 try:
                     raw = conf_stg.download_blob(
                         f"customer_config/{cname}.json")
-                    cfg = json.loads(raw)
+                    cfg = orjson.loads(raw)
                     cfg["enabled"] = bool(state)
                     conf_stg.upload_blob(
                         blob_name=f"customer_config/{cname}.json",
-                        data=json.dumps(
-                            cfg, ensure_ascii=False).encode("utf-8"),
+                        data=orjson.dumps(cfg),
                         overwrite=True,
                         content_settings=ContentSettings(
                             content_type="application/json; charset=utf-8"
@@ -250,6 +281,16 @@ def handle_post(req: func.HttpRequest) -> func.HttpResponse:
                 flash(messages, "success", "Asiakkaiden tilat päivitetty.")
                 next_method = "edit_customer"
 
+            # Redirect so the browser shows the result with a plain GET and
+            # a reload does not resubmit the form
+            query = urlencode(
+                {"method": next_method, "flash": encode_flash(messages)})
+            return func.HttpResponse(
+                status_code=303,
+                # Relative, so the browser stays on the public host it used
+                headers={"Location": f"?{query}"},
+            )
+
         token, cookie_val = generate_csrf_token()
         context = prepare_template_context(method=next_method, messages=messages, csrf_token=token)
         context["headers"] = {
@@ -2,17 +2,27 @@
 
 import json
 import logging
-from typing import List, Optional, Dict
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Tuple
 
+import orjson
 from azure.core.exceptions import AzureError
 
-from asiakasrajapinnat_master.storage_handler import StorageHandler
+from asiakasrajapinnat_master.storage_handler import StorageHandler, get_storage
 
 from .utils import flash
 
 # Storage handlers used across the configuration UI
-src_stg = StorageHandler(container_name="vitecpowerbi")
-conf_stg = StorageHandler(container_name="asiakasrajapinnat")
+src_stg = get_storage(container_name="vitecpowerbi")
+conf_stg = get_storage(container_name="asiakasrajapinnat")
+
+# Number of customer configs downloaded in parallel
+DOWNLOAD_WORKERS = 8
+
+# Parsed customer configs by blob name, with the ETag they were read at
+_customer_cache: Dict[str, Tuple[str, Dict]] = {}
+_customer_cache_lock = threading.Lock()
 
 
 def create_containers(
@@ -31,18 +41,21 @@ def create_containers(
     prefix = f"Rajapinta/{src_container}"
     history_dir = prefix + "history/"
 
-    list_blobs = src_stg.list_blobs(prefix=prefix)
-    if not list_blobs:
+    marker = None
+    if not src_stg.prefix_exists(prefix):
+        # A single empty marker makes the history "directory" visible; the
+        # pipeline only reads CSV files directly under the prefix so it is
+        # never picked up as input.
+        marker = history_dir + ".keep"
         try:
-            marker = history_dir + ".keep"
             src_stg.upload_blob(marker, b"", overwrite=True)
-            src_stg.container_client.delete_blob(marker)
         except AzureError as e:
             logging.error(
                 "Could not create directory marker %s: %s",
                 marker,
                 e,
             )
+            marker = None
     else:
         src_container = src_container.strip("/")
         flash(
@@ -52,39 +65,88 @@ def create_containers(
             "Please choose a different name.",
         )
 
+    # One-off admin container, not worth keeping in the shared handler cache
     dst_stg = StorageHandler(container_name=dest_container)
-    if dst_stg.container_exists():
-        dest_container = dest_container.strip("/")
-        flash(
-            messages,
-            "error",
-            f"Destination container '{dest_container}' already exists. "
-            "Please choose a different name.",
-        )
+    try:
+        created = dst_stg.create_container()
+    except AzureError as e:
+        flash(messages, "error",
+              f"Failed to create destination container: {e}")
+        logging.error("Failed to create destination container: %s", e)
+        created = False
     else:
-        try:
-            dst_stg.create_container()
-            logging.info("Destination container '%s' created.", dest_container)
-        except AzureError as e:
-            flash(messages, "error",
-                  f"Failed to create destination container: {e}")
-            logging.error("Failed to create destination container: %s", e)
+        if not created:
+            dest_container = dest_container.strip("/")
+            flash(
+                messages,
+                "error",
+                f"Destination container '{dest_container}' already exists. "
+                "Please choose a different name.",
+            )
+
+    # Remove our marker on failure so a retry is not told the source exists
+    if not created and marker is not None:
+        _delete_marker(marker)
+
+
+def _delete_marker(marker: str) -> None:
+    """Delete a directory marker left behind by a failed ``create_containers``."""
+    try:
+        src_stg.container_client.delete_blob(marker)
+    except AzureError as e:
+        logging.error("Could not delete directory marker %s: %s", marker, e)
+
+
+def _load_customer_config(cfg_file: str) -> Optional[Dict]:
+    """Download and parse one customer config, ``None`` if it fails."""
+    try:
+        raw = conf_stg.download_blob(cfg_file)
+        return orjson.loads(raw)
+    except (AzureError, json.JSONDecodeError) as e:
+        logging.error(
+            "Failed to parse JSON from blob '%s': %s", cfg_file, e)
+        return None
 
 
 def get_customers() -> List[str]:
-    """Load customer configuration files from storage."""
+    """
+    Load customer configuration files from storage.
+
+    Parsed configs are kept per blob together with their ETag, so a warm
+    instance only lists the configs and downloads the ones that changed.
+    """
     logging.info("Loading customer configuration files")
     customers: List[str] = []
     try:
-        for cfg_file in conf_stg.list_json_blobs("customer_config"):
-            try:
-                raw = conf_stg.download_blob(cfg_file)
-                data = json.loads(raw)
-                customers.append(data)
-            except (AzureError, json.JSONDecodeError) as e:
-                logging.error(
-                    "Failed to parse JSON from blob '%s': %s", cfg_file, e)
-                continue
+        listing = list(
+            conf_stg.iter_blob_properties_by_ext(".json", "customer_config"))
+        with _customer_cache_lock:
+            stale = [
+                blob for blob in listing
+                if _customer_cache.get(blob.name, (None, None))[0] != blob.etag
+            ]
+        # Download in parallel outside the lock, ``map`` keeps the listing order
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as executor:
+            loaded = list(executor.map(
+                _load_customer_config, [blob.name for blob in stale]))
+
+        with _customer_cache_lock:
+            for blob, data in zip(stale, loaded):
+                if data is None:
+                    _customer_cache.pop(blob.name, None)
+                else:
+                    _customer_cache[blob.name] = (blob.etag, data)
+
+            # Forget configs that were deleted from storage
+            listed = {blob.name for blob in listing}
+            for name in list(_customer_cache):
+                if name not in listed:
+                    _customer_cache.pop(name, None)
+
+            for blob in listing:
+                cached = _customer_cache.get(blob.name)
+                if cached is not None:
+                    customers.append(cached[1])
     except AzureError as e:
         logging.error("Failed to list blobs under CustomerConfig/: %s", e)
     return customers
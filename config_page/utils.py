@@ -1,15 +1,23 @@
 """Helper functions for rendering templates and managing flash messages."""
 
 import os
+import base64
 import hmac
 import hashlib
 import secrets
 import logging
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import unquote
 
 import azure.functions as func
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+import orjson
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    select_autoescape,
+)
 
 module_dir = os.path.dirname(__file__)
 templates_dir = os.path.join(module_dir, "templates")
@@ -17,11 +25,23 @@ static_dir = os.path.join(module_dir, "static")
 css_dir = os.path.join(static_dir, "css")
 js_dir = os.path.join(static_dir, "js")
 
+# Templates never change at runtime: skip the per-render up-to-date check.
+# Compiled bytecode is kept in the temp dir so a cold start on the same
+# instance can skip parsing the templates again.
 jinja_env = Environment(
     loader=FileSystemLoader(templates_dir),
     autoescape=select_autoescape(["html", "xml"]),
+    auto_reload=False,
+    cache_size=-1,
+    bytecode_cache=FileSystemBytecodeCache(),
 )
 
+# Compile every page template once at import
+_templates = {
+    name: jinja_env.get_template(name)
+    for name in jinja_env.list_templates(extensions=["html"])
+}
+
 # Secret used for signing CSRF tokens. This must be provided
 # via environment variables. Fail fast if it's missing so that
 # misconfiguration doesn't silently disable protection.
@@ -34,22 +54,68 @@ def flash(messages: List[Dict[str, str]], category: str = "error", message: str
     messages.append({"category": category, "message": message})
 
 
-def render_template(context: Dict[str, Any]) -> func.HttpResponse:
-    """Render a Jinja2 template using ``context``."""
+# Rendered bodies and ETags of pages whose output does not depend on the request
+_page_cache: Dict[str, Tuple[str, str]] = {}
+
+# Browsers may reuse a cached page for this long before revalidating it
+PAGE_MAX_AGE = 60
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """Return True if ``etag`` is listed in an ``If-None-Match`` header."""
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def render_template(
+    context: Dict[str, Any],
+    cache_key: Optional[str] = None,
+    if_none_match: str = "",
+) -> func.HttpResponse:
+    """
+    Render a Jinja2 template using ``context``.
+
+    With ``cache_key`` the rendered body is stored and reused on later calls
+    with the same key, only pass it for pages without per-request data. Such
+    responses carry an ``ETag`` and get a bodiless 304 when ``if_none_match``
+    already names it.
+    """
     template_name = context.get("template_name", "")
     status_code = context.get("status_code", 200)
     mimetype = context.get("mimetype", "text/html")
     headers = context.get("headers")
 
-    render_args = context.copy()
-    messages = render_args.get("messages") or []
-    render_args["messages"] = messages
-    render_args.pop("template_name", None)
-    render_args.pop("status_code", None)
-    render_args.pop("mimetype", None)
+    cached = _page_cache.get(cache_key) if cache_key else None
+    if cached is None:
+        render_args = context.copy()
+        messages = render_args.get("messages") or []
+        render_args["messages"] = messages
+        render_args.pop("template_name", None)
+        render_args.pop("status_code", None)
+        render_args.pop("mimetype", None)
+
+        template = _templates.get(template_name) or jinja_env.get_template(
+            template_name)
+        rendered = template.render(**render_args)
+        if cache_key:
+            digest = hashlib.blake2b(
+                rendered.encode("utf-8"), digest_size=16).hexdigest()
+            cached = _page_cache[cache_key] = (rendered, f'"{digest}"')
+    else:
+        rendered = cached[0]
+
+    if cached is not None:
+        etag = cached[1]
+        headers = {
+            **(headers or {}),
+            "ETag": etag,
+            "Cache-Control": f"private, max-age={PAGE_MAX_AGE}",
+        }
+        if _etag_matches(etag, if_none_match):
+            return func.HttpResponse(status_code=304, headers=headers)
 
-    template = jinja_env.get_template(template_name)
-    rendered = template.render(**render_args)
     return func.HttpResponse(
         rendered,
         status_code=status_code,
@@ -58,53 +124,54 @@ def render_template(context: Dict[str, Any]) -> func.HttpResponse:
     )
 
 
-def _read_files(base_dir: str, files: List[str]) -> List[str]:
-    blocks: List[str] = []
-    for name in files:
-        path = os.path.join(base_dir, name)
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as fh:
-                blocks.append(fh.read())
-    return blocks
+def _load_dir(base_dir: str, extension: str) -> Dict[str, str]:
+    """Read every ``extension`` file in ``base_dir`` into a name -> content map."""
+    contents: Dict[str, str] = {}
+    if not os.path.isdir(base_dir):
+        return contents
+    for name in sorted(os.listdir(base_dir)):
+        if name.endswith(extension):
+            with open(os.path.join(base_dir, name), "r", encoding="utf-8") as fh:
+                contents[name] = fh.read()
+    return contents
+
+
+# Static assets do not change at runtime, so read them once at import
+_css_files = _load_dir(css_dir, ".css")
+_js_files = _load_dir(js_dir, ".js")
+_html_files = _load_dir(templates_dir, ".html")
+
+
+def _read_files(cache: Dict[str, str], files: List[str]) -> List[str]:
+    return [cache[name] for name in files if name in cache]
 
 
 def get_css_blocks(file_specific_styles: Optional[List[str]] = None) -> List[str]:
     """Return CSS snippets for the page."""
     global_styles = ["base.css", "flash.css", "navbar.css"]
-    css_blocks = _read_files(css_dir, global_styles)
+    css_blocks = _read_files(_css_files, global_styles)
     if file_specific_styles:
-        css_blocks.extend(_read_files(css_dir, file_specific_styles))
+        css_blocks.extend(_read_files(_css_files, file_specific_styles))
     return css_blocks
 
 
 def get_js_blocks(file_specific_scripts: Optional[List[str]] = None) -> List[str]:
     """Return JavaScript snippets for the page."""
     global_scripts = ["navbar.js", "flash.js"]
-    js_blocks = _read_files(js_dir, global_scripts)
+    js_blocks = _read_files(_js_files, global_scripts)
     if file_specific_scripts:
-        js_blocks.extend(_read_files(js_dir, file_specific_scripts))
+        js_blocks.extend(_read_files(_js_files, file_specific_scripts))
     return js_blocks
 
 
 def get_html_blocks(file_specific_html: Optional[List[str]] = None) -> List[Dict[str, str]]:
     """Return HTML template fragments to include in the page."""
-    html_blocks: List[Dict[str, str]] = []
-    global_html = ["navbar.html"]
-
-    for name in global_html:
-        path = os.path.join(templates_dir, name)
-        if os.path.exists(path):
-            with open(path, "r", encoding="utf-8") as fh:
-                html_blocks.append({"name": name, "content": fh.read()})
-
-    if file_specific_html:
-        for name in file_specific_html:
-            path = os.path.join(templates_dir, name)
-            if os.path.exists(path):
-                with open(path, "r", encoding="utf-8") as fh:
-                    html_blocks.append({"name": name, "content": fh.read()})
-
-    return html_blocks
+    names = ["navbar.html"] + (file_specific_html or [])
+    return [
+        {"name": name, "content": _html_files[name]}
+        for name in names
+        if name in _html_files
+    ]
 
 
 def _sign(value: str) -> str:
@@ -133,6 +200,50 @@ def validate_csrf_token(form_token: str, cookie_value: str) -> bool:
     return hmac.compare_digest(form_token, token)
 
 
+# Seconds a redirect's flash messages stay valid after the POST
+FLASH_MAX_AGE = 300
+
+
+def _sign_flash(payload: str) -> str:
+    """Sign a flash payload, prefixed so it can never pass as a CSRF value."""
+    return _sign("flash:" + payload)
+
+
+def encode_flash(messages: List[Dict[str, str]]) -> str:
+    """Return ``messages`` as a signed, timestamped, URL safe string."""
+    body = orjson.dumps({"ts": int(time.time()), "messages": messages})
+    payload = base64.urlsafe_b64encode(body).decode("ascii")
+    return f"{payload}.{_sign_flash(payload)}"
+
+
+def decode_flash(value: str) -> List[Dict[str, str]]:
+    """
+    Return the messages in a value from ``encode_flash``.
+
+    Returns ``[]`` if the signature is invalid or the value is older than
+    ``FLASH_MAX_AGE`` seconds.
+    """
+    payload, _, signature = value.rpartition(".")
+    if not payload or not hmac.compare_digest(_sign_flash(payload), signature):
+        return []
+    try:
+        data = orjson.loads(base64.urlsafe_b64decode(payload))
+    except (ValueError, orjson.JSONDecodeError):
+        return []
+    if not isinstance(data, dict):
+        return []
+    ts = data.get("ts")
+    # ``abs`` tolerates small clock differences between instances
+    if not isinstance(ts, int) or abs(time.time() - ts) > FLASH_MAX_AGE:
+        return []
+    messages = data.get("messages")
+    return [
+        {"category": str(m.get("category", "")),
+         "message": str(m.get("message", ""))}
+        for m in messages if isinstance(m, dict)
+    ] if isinstance(messages, list) else []
+
+
 def parse_cookie(cookie_header: str) -> Dict[str, str]:
     """Simple cookie parser returning a mapping of cookie names to values."""
     cookies: Dict[str, str] = {}
@@ -0,0 +1,47 @@
+import os
+import sys
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from azure.storage.blob import BlobPrefix
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Asiakasrajapinnat-AZFunction")))
+
+from asiakasrajapinnat_master.customer import Customer, CustomerConfig
+
+
+def _blob(name, day):
+    blob = MagicMock(last_modified=datetime(2024, 1, day, tzinfo=timezone.utc))
+    blob.name = name
+    return blob
+
+
+def test_get_data_reads_latest_csv_directly_under_prefix():
+    cfg = CustomerConfig(
+        name="test",
+        konserni={100},
+        source_container="src/",
+        destination_container="dest/",
+        file_format="csv",
+        file_encoding="utf-8",
+        extra_columns=None,
+        enabled=True,
+        base_columns={"A": {"name": "ValueA", "dtype": "string"}},
+    )
+    customer = Customer(cfg)
+    stg = MagicMock(container_name="cont")
+    stg.container_client.walk_blobs.return_value = [
+        _blob("Rajapinta/src/old.csv", 1),
+        BlobPrefix(name="Rajapinta/src/history/"),
+        _blob("Rajapinta/src/new.csv", 3),
+        _blob("Rajapinta/src/notes.txt", 5),
+    ]
+    stg.download_blob.return_value = b"A;Other\nx;y\n"
+
+    df = customer.get_data(stg, "Rajapinta/src")
+
+    stg.container_client.walk_blobs.assert_called_once_with(
+        name_starts_with="Rajapinta/src/", delimiter="/")
+    stg.download_blob.assert_called_once_with("Rajapinta/src/new.csv")
+    assert customer.file_in_process == "Rajapinta/src/new.csv"
+    assert list(df.columns) == ["A"]
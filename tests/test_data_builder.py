@@ -27,5 +27,34 @@ def test_build_csv_uses_unix_newlines():
     builder = DataBuilder(cust)
     csv = builder.build_csv(df, encoding="utf-8")
     # Should only have as many newline characters as rows + header
-    assert csv.count("\n") == len(df) + 1
-    assert "\r\n" not in csv
+    assert csv.count(b"\n") == len(df) + 1
+    assert b"\r\n" not in csv
+
+
+def test_build_csv_uses_requested_encoding():
+    df = pd.DataFrame({"A": ["ä"], "B": [1]})
+    builder = DataBuilder(_make_customer())
+    csv = builder.build_csv(df, encoding="iso-8859-1")
+    assert csv == "A;B\nä;1\n".encode("iso-8859-1")
+
+
+def test_build_json_formats_decimals_and_nulls():
+    cfg = CustomerConfig(
+        name="test",
+        konserni=set(),
+        source_container="src/",
+        destination_container="dst/",
+        file_format="json",
+        file_encoding="utf-8",
+        extra_columns=None,
+        enabled=True,
+        base_columns={
+            "A": {"name": "A", "dtype": "float", "decimals": 2},
+            "B": {"name": "B", "dtype": "string"},
+        },
+    )
+    builder = DataBuilder(Customer(cfg))
+    df = pd.DataFrame({"A": [1.5, None], "B": ["ä", None]})
+    df = df.astype(object).where(df.notna(), None)
+    data = builder.build_json(df)
+    assert data == '[{"A":1.50,"B":"ä"}\n,{"A":null,"B":null}\n]'.encode("utf-8")
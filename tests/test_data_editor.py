@@ -68,3 +68,11 @@ def test_validate_concern_number_fails():
     editor.delete_row(0)
     with pytest.raises(ValueError):
         editor.validate_concern_number()
+
+
+def test_rename_and_cast_keeps_numeric_floats():
+    editor = make_editor()
+    editor.df["A"] = [1.25, 2.5, float("nan")]
+    editor.drop_unmapped_columns().rename_and_cast_datatypes()
+    assert editor.df["ValueA"].tolist()[:2] == [1.25, 2.5]
+    assert pd.isna(editor.df["ValueA"].iloc[2])
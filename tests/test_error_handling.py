@@ -2,6 +2,9 @@ import os
 import sys
 import json
 import pytest
+from unittest.mock import MagicMock
+
+import azure.functions as func
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Asiakasrajapinnat-AZFunction")))
 
@@ -30,3 +33,21 @@ def test_invalid_method_raises_error():
         
     with pytest.raises(ClientError):
         handlers.prepare_template_context(method="unknown")
+
+
+def test_successful_post_redirects_with_relative_location(monkeypatch):
+    monkeypatch.setattr(handlers, "conf_stg", MagicMock())
+    token, cookie = handlers.generate_csrf_token()
+    req = func.HttpRequest(
+        method="POST",
+        url="http://backend.internal/api/config_page",
+        body=f"method=delete_customer&name=asiakas&csrf_token={token}".encode(),
+        headers={"Cookie": f"csrf_token={cookie}"},
+    )
+
+    resp = handlers.handle_post(req)
+
+    location = resp.headers["Location"]
+    assert resp.status_code == 303
+    assert location.startswith("?method=edit_customer&flash=")
+    assert "backend.internal" not in location
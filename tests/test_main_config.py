@@ -0,0 +1,34 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+from azure.core.exceptions import HttpResponseError
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Asiakasrajapinnat-AZFunction")))
+
+from asiakasrajapinnat_master import main_config
+from asiakasrajapinnat_master.storage_handler import StorageHandler
+
+
+def test_load_main_config_reuses_unchanged_config(monkeypatch):
+    monkeypatch.setattr(main_config, "_cache", {})
+    stg = StorageHandler.__new__(StorageHandler)
+    stg.container_name = "conf"
+    stg.container_client = MagicMock()
+    blob_client = stg.container_client.get_blob_client.return_value
+    downloader = MagicMock()
+    downloader.readall.return_value = (
+        b'{"base_columns": {"A": {"name": "a", "dtype": "string"}}}')
+    downloader.properties.etag = "v1"
+    # A conditional download of an unchanged blob fails with a 304
+    blob_client.download_blob.side_effect = [
+        downloader,
+        HttpResponseError(response=MagicMock(status_code=304)),
+    ]
+
+    first = main_config.load_main_config(stg)
+    second = main_config.load_main_config(stg)
+
+    assert second is first
+    assert first.base_columns == {"A": {"name": "a", "dtype": "string"}}
+    assert blob_client.download_blob.call_args.kwargs["etag"] == "v1"
@@ -2,6 +2,9 @@ import os
 import sys
 from unittest.mock import MagicMock
 
+import pytest
+from azure.core.exceptions import HttpResponseError
+
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Asiakasrajapinnat-AZFunction")))
 
 from asiakasrajapinnat_master import storage_handler
@@ -10,18 +13,43 @@ from asiakasrajapinnat_master import storage_handler
 def test_move_file_to_dir():
     handler = storage_handler.StorageHandler.__new__(storage_handler.StorageHandler)
     handler.container_name = "cont"
-    handler.download_blob = MagicMock(return_value=b"data")
+    handler.download_blob = MagicMock()
     handler.upload_blob = MagicMock()
     handler.container_client = MagicMock()
+    source_client = MagicMock(url="https://acc/cont/in/file.csv")
+    dest_client = MagicMock()
+    dest_client.start_copy_from_url.return_value = {"copy_status": "success"}
+    handler.container_client.get_blob_client.side_effect = [source_client, dest_client]
 
     dest = handler.move_file_to_dir("in/file.csv", "processed")
 
     assert dest == "processed/file.csv"
-    handler.download_blob.assert_called_once_with("in/file.csv")
-    handler.upload_blob.assert_called_once_with("processed/file.csv", b"data", overwrite=True)
+    handler.container_client.get_blob_client.assert_any_call("processed/file.csv")
+    dest_client.start_copy_from_url.assert_called_once_with(source_client.url)
+    handler.download_blob.assert_not_called()
+    handler.upload_blob.assert_not_called()
     handler.container_client.delete_blob.assert_called_once_with("in/file.csv")
 
 
+def test_move_file_to_dir_aborts_stalled_copy():
+    handler = storage_handler.StorageHandler.__new__(storage_handler.StorageHandler)
+    handler.container_name = "cont"
+    handler.copy_poll_interval = 0
+    handler.copy_timeout = 0
+    handler.container_client = MagicMock()
+    source_client = MagicMock(url="https://acc/cont/in/file.csv")
+    dest_client = MagicMock()
+    dest_client.start_copy_from_url.return_value = {
+        "copy_status": "pending", "copy_id": "abc"}
+    handler.container_client.get_blob_client.side_effect = [source_client, dest_client]
+
+    with pytest.raises(RuntimeError):
+        handler.move_file_to_dir("in/file.csv", "processed")
+
+    dest_client.abort_copy.assert_called_once_with("abc")
+    handler.container_client.delete_blob.assert_not_called()
+
+
 def test_blob_exists():
     handler = storage_handler.StorageHandler.__new__(storage_handler.StorageHandler)
     handler.container_client = MagicMock()
@@ -33,3 +61,118 @@ def test_blob_exists():
     handler.container_client.get_blob_client.assert_called_once_with("foo.json")
     blob_client.exists.assert_called_once_with()
 
+
+def test_upload_blob_streams_bytes():
+    handler = storage_handler.StorageHandler.__new__(storage_handler.StorageHandler)
+    handler.container_client = MagicMock()
+    blob_client = MagicMock()
+    handler.container_client.get_blob_client.return_value = blob_client
+
+    handler.upload_blob("out.json", b"payload")
+
+    args, kwargs = blob_client.upload_blob.call_args
+    assert args[0].read() == b"payload"
+    assert kwargs["length"] == len(b"payload")
+    assert kwargs["overwrite"] is True
+    assert kwargs["max_concurrency"] == handler.max_concurrency
+
+
+def test_download_blob_uses_parallel_ranges():
+    handler = storage_handler.StorageHandler.__new__(storage_handler.StorageHandler)
+    handler.container_client = MagicMock()
+    blob_client = MagicMock()
+    blob_client.download_blob.return_value.readall.return_value = b"payload"
+    handler.container_client.get_blob_client.return_value = blob_client
+
+    assert handler.download_blob("in.csv") == b"payload"
+    blob_client.download_blob.assert_called_once_with(
+        max_concurrency=handler.max_concurrency)
+
+
+def test_download_blob_if_modified_returns_none_when_unchanged():
+    handler = storage_handler.StorageHandler.__new__(storage_handler.StorageHandler)
+    handler.container_client = MagicMock()
+    blob_client = MagicMock()
+    blob_client.download_blob.side_effect = HttpResponseError(
+        response=MagicMock(status_code=304))
+    handler.container_client.get_blob_client.return_value = blob_client
+
+    assert handler.download_blob_if_modified("main_config.json", "v1") == (None, "v1")
+
+
+def test_download_blob_if_modified_reraises_other_errors():
+    handler = storage_handler.StorageHandler.__new__(storage_handler.StorageHandler)
+    handler.container_client = MagicMock()
+    blob_client = MagicMock()
+    blob_client.download_blob.side_effect = HttpResponseError(
+        response=MagicMock(status_code=500))
+    handler.container_client.get_blob_client.return_value = blob_client
+
+    with pytest.raises(HttpResponseError):
+        handler.download_blob_if_modified("main_config.json", "v1")
+
+
+def test_handlers_share_blob_service(monkeypatch):
+    service = MagicMock()
+    factory = MagicMock(return_value=service)
+    monkeypatch.setattr(storage_handler, "_blob_service", None)
+    monkeypatch.setattr(
+        storage_handler.BlobServiceClient, "from_connection_string", factory)
+    monkeypatch.setenv("AzureWebJobsStorage", "UseDevelopmentStorage=true")
+
+    first = storage_handler.StorageHandler("one")
+    second = storage_handler.StorageHandler("two")
+
+    assert first.blob_service is second.blob_service is service
+    factory.assert_called_once_with("UseDevelopmentStorage=true")
+
+
+def test_get_storage_returns_cached_handler(monkeypatch):
+    monkeypatch.setattr(storage_handler, "_handlers", {})
+    monkeypatch.setattr(storage_handler, "_get_blob_service", MagicMock())
+
+    first = storage_handler.get_storage("cont")
+    second = storage_handler.get_storage("cont")
+
+    assert first is second
+    assert storage_handler.get_storage("other") is not first
+
+
+def test_get_storage_verifies_cached_handler(monkeypatch):
+    monkeypatch.setattr(storage_handler, "_handlers", {})
+    monkeypatch.setattr(storage_handler, "_get_blob_service", MagicMock())
+
+    handler = storage_handler.get_storage("cont")
+    handler.container_client.exists.return_value = False
+
+    with pytest.raises(ValueError):
+        storage_handler.get_storage("cont", verify_existence=True)
+
+    handler.container_client.exists.return_value = True
+    assert storage_handler.get_storage("cont", verify_existence=True) is handler
+
+
+def test_prefix_exists_fetches_single_result():
+    handler = storage_handler.StorageHandler.__new__(storage_handler.StorageHandler)
+    handler.container_client = MagicMock()
+    handler.container_client.list_blobs.return_value = iter([MagicMock()])
+
+    assert handler.prefix_exists("Rajapinta/src/")
+    handler.container_client.list_blobs.assert_called_once_with(
+        name_starts_with="Rajapinta/src/", results_per_page=1)
+
+    handler.container_client.list_blobs.return_value = iter([])
+    assert not handler.prefix_exists("Rajapinta/other/")
+
+
+def test_create_container_reports_existing():
+    handler = storage_handler.StorageHandler.__new__(storage_handler.StorageHandler)
+    handler.container_name = "cont"
+    handler.container_client = MagicMock()
+
+    assert handler.create_container() is True
+
+    handler.container_client.create_container.side_effect = (
+        storage_handler.ResourceExistsError("exists"))
+    assert handler.create_container() is False
+    handler.container_client.exists.assert_not_called()
@@ -0,0 +1,58 @@
+import os
+import sys
+from unittest.mock import MagicMock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Asiakasrajapinnat-AZFunction")))
+
+os.environ.setdefault("CSRF_SECRET", "test-secret")
+os.environ.setdefault(
+    "AzureWebJobsStorage",
+    "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;"
+    "AccountKey=Eby8vdM02xNOcqFeSClZg==;"
+    "BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;",
+)
+
+from config_page import storage_utils
+
+
+def _blob(name, etag):
+    blob = MagicMock(etag=etag)
+    blob.name = name
+    return blob
+
+
+def test_get_customers_only_downloads_changed_configs(monkeypatch):
+    stg = MagicMock()
+    stg.iter_blob_properties_by_ext.side_effect = [
+        [_blob("customer_config/a.json", "1"), _blob("customer_config/b.json", "1")],
+        [_blob("customer_config/a.json", "1"), _blob("customer_config/b.json", "2")],
+    ]
+    stg.download_blob.side_effect = lambda name: (
+        b'{"name": "%s"}' % name[-6:-5].encode())
+    monkeypatch.setattr(storage_utils, "conf_stg", stg)
+    monkeypatch.setattr(storage_utils, "_customer_cache", {})
+
+    assert storage_utils.get_customers() == [{"name": "a"}, {"name": "b"}]
+    assert storage_utils.get_customers() == [{"name": "a"}, {"name": "b"}]
+
+    downloaded = [c.args[0] for c in stg.download_blob.call_args_list]
+    assert sorted(downloaded) == [
+        "customer_config/a.json", "customer_config/b.json", "customer_config/b.json"]
+
+
+def test_create_containers_removes_marker_when_destination_exists(monkeypatch):
+    src = MagicMock()
+    src.prefix_exists.return_value = False
+    dst = MagicMock()
+    dst.create_container.return_value = False
+    monkeypatch.setattr(storage_utils, "src_stg", src)
+    monkeypatch.setattr(storage_utils, "StorageHandler", lambda container_name: dst)
+    messages = []
+
+    storage_utils.create_containers("asiakas/", "kohde", messages)
+
+    src.upload_blob.assert_called_once_with(
+        "Rajapinta/asiakas/history/.keep", b"", overwrite=True)
+    src.container_client.delete_blob.assert_called_once_with(
+        "Rajapinta/asiakas/history/.keep")
+    assert [m["category"] for m in messages] == ["error"]
@@ -0,0 +1,45 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "Asiakasrajapinnat-AZFunction")))
+
+os.environ.setdefault("CSRF_SECRET", "test-secret")
+os.environ.setdefault(
+    "AzureWebJobsStorage",
+    "DefaultEndpointsProtocol=http;AccountName=devstoreaccount1;"
+    "AccountKey=Eby8vdM02xNOcqFeSClZg==;"
+    "BlobEndpoint=http://127.0.0.1:10000/devstoreaccount1;",
+)
+
+from config_page import utils
+
+
+def test_cached_page_revalidates_with_etag(monkeypatch):
+    monkeypatch.setattr(utils, "_page_cache", {})
+    context = {"template_name": "index.html", "messages": []}
+
+    first = utils.render_template(context, cache_key="home")
+    etag = first.headers["ETag"]
+    again = utils.render_template(context, cache_key="home", if_none_match=etag)
+
+    assert first.status_code == 200
+    assert again.status_code == 304
+    assert again.get_body() == b""
+
+
+def test_flash_round_trip_rejects_tampering():
+    messages = [{"category": "success", "message": "Asiakas 'ä' luotu."}]
+    value = utils.encode_flash(messages)
+
+    assert utils.decode_flash(value) == messages
+    assert utils.decode_flash("x" + value) == []
+    assert utils.decode_flash("bogus") == []
+
+
+def test_flash_expires(monkeypatch):
+    messages = [{"category": "success", "message": "ok"}]
+    value = utils.encode_flash(messages)
+    now = utils.time.time()
+
+    monkeypatch.setattr(utils.time, "time", lambda: now + utils.FLASH_MAX_AGE + 1)
+    assert utils.decode_flash(value) == []